@@ -3,7 +3,7 @@ import numpy as np
 import plotly.graph_objects as go
 
 from data import get_stock_data
-from monte_carlo import simulate_price_paths, get_price_statistics
+from monte_carlo import simulate_price_paths, simulate_final_only, get_final_price_statistics
 
 # ==========================================
 # PAGE CONFIG
@@ -37,7 +37,12 @@ html, body, [class*="css"]  {
     color:#9ca3af;
     margin-bottom:25px;
 }
+.card-row {
+    display:flex;
+    gap:12px;
+}
 .card {
+    flex:1;
     background: rgba(255,255,255,0.05);
     backdrop-filter: blur(10px);
     padding:18px;
@@ -82,6 +87,26 @@ ticker = st.sidebar.text_input("Stock Ticker", "NVDA", key="ticker_input").upper
 lookback_days = st.sidebar.slider("Lookback Window (Days)", 30, 252, 60, key="lookback_slider")
 future_days = st.sidebar.slider("Forecast Horizon (Days)", 5, 180, 30, key="horizon_slider")
 sims = st.sidebar.slider("Monte Carlo Simulations", 1000, 20000, 5000, step=1000, key="sims_slider")
+seed = st.sidebar.number_input("Random Seed", min_value=0, value=42, step=1, key="seed_input")
+use_gpu = st.sidebar.checkbox(
+    "Use GPU (CUDA)",
+    value=False,
+    help="Run the simulation on a CUDA GPU when one is available. The GPU uses its own random stream, so the same seed gives different paths than on the CPU.",
+    key="gpu_checkbox"
+)
+sampling = st.sidebar.selectbox(
+    "Sampling Method",
+    ["Pseudo-random", "Sobol (quasi-random)"],
+    help="Sobol quasi-random draws cover the probability space more evenly, which can sharpen the percentile estimates for the same number of simulations.",
+    key="sampling_select"
+)
+sampler = "sobol" if sampling.startswith("Sobol") else "pseudo"
+show_paths = st.sidebar.checkbox(
+    "Show Price Paths",
+    value=True,
+    help="Plot the median and 5-95% band over time. Turning this off simulates final prices only, which is faster and lighter on memory.",
+    key="paths_checkbox"
+)
 
 vol_shock = st.sidebar.slider(
     label="Volatility Multiplier ",
@@ -107,10 +132,7 @@ st.sidebar.caption("Model assumes log-normal dynamics (GBM)")
 # LOAD DATA
 # ==========================================
 try:
-    current_price, returns = get_stock_data(ticker, lookback_days)
-    current_price = float(current_price)
-    mu = float(returns.mean())
-    sigma = float(returns.std())
+    current_price, _, mu, sigma = get_stock_data(ticker, lookback_days)
 except Exception as e:
     st.error(f"Data error: {e}")
     st.stop()
@@ -118,15 +140,43 @@ except Exception as e:
 # ==========================================
 # MONTE CARLO SIMULATION
 # ==========================================
-paths = simulate_price_paths(
-    current_price,
-    mu,
-    sigma * vol_shock,
-    future_days,
-    sims
-)
+@st.cache_data(max_entries=8, show_spinner=False)
+def run_simulation(S0, mu, sigma, days, sims, seed, sampler, use_gpu):
+    return simulate_price_paths(S0, mu, sigma, days, sims, seed=seed, sampler=sampler, use_gpu=use_gpu)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def run_final_prices(S0, mu, sigma, days, sims, seed, sampler):
+    return simulate_final_only(S0, mu, sigma, days, sims, seed=seed, sampler=sampler)
+
+def final_prices_for(S0, mu, sigma, days, sims, seed, sampler, use_gpu, full_paths):
+    # Reuse the full run when the paths are shown anyway; otherwise skip the (days x sims) matrix
+    # (the final-only path is CPU-only, so use_gpu only applies to the full run)
+    if full_paths:
+        return run_simulation(S0, mu, sigma, days, sims, seed, sampler, use_gpu)[-1]
+    return run_final_prices(S0, mu, sigma, days, sims, seed, sampler)
 
-stats = get_price_statistics(paths)
+# Derived results are keyed on the same inputs, so they reuse the cached run
+@st.cache_data(max_entries=8, show_spinner=False)
+def simulation_statistics(S0, mu, sigma, days, sims, seed, sampler, use_gpu, full_paths):
+    return get_final_price_statistics(final_prices_for(S0, mu, sigma, days, sims, seed, sampler, use_gpu, full_paths), S0)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def percentile_paths(S0, mu, sigma, days, sims, seed, sampler, use_gpu):
+    paths = run_simulation(S0, mu, sigma, days, sims, seed, sampler, use_gpu)
+    # One pass over the matrix for all three curves; 'lower' skips interpolation
+    p5_path, median_path, p95_path = np.quantile(paths, [0.05, 0.5, 0.95], axis=1, method="lower")
+    return median_path, p5_path, p95_path
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def price_histogram(S0, mu, sigma, days, sims, seed, sampler, use_gpu, full_paths, bins=60):
+    # Bin server-side so the browser gets `bins` bars instead of every final price
+    final_prices = final_prices_for(S0, mu, sigma, days, sims, seed, sampler, use_gpu, full_paths)
+    counts, edges = np.histogram(final_prices, bins=bins)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    return centers, counts
+
+sim_args = (current_price, mu, sigma * vol_shock, future_days, sims, int(seed), sampler, use_gpu)
+stats = simulation_statistics(*sim_args, show_paths)
 mean_price = stats["mean"]
 median_price = stats["median"]
 p5 = stats["p5"]
@@ -150,62 +200,60 @@ median_arrow, median_color, median_delta = arrow(median_price, current_price)
 # METRIC CARDS
 # ==========================================
 st.markdown('<div class="section-title">Price Estimates</div>', unsafe_allow_html=True)
-cols = st.columns(5)
 
-def card(col, label, value, arrow_symbol=None, delta=None, color=None):
+def card_html(label, value, arrow_symbol=None, delta=None, color=None):
+    delta_html = ""
     if arrow_symbol:
-        col.markdown(f"""
-        <div class="card">
-            <div class="metric-label">{label}</div>
-            <div class="metric-value">{value}</div>
-            <div class="metric-delta" style="color:{color}">{arrow_symbol} {abs(delta):.2f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        col.markdown(f"""
-        <div class="card">
-            <div class="metric-label">{label}</div>
-            <div class="metric-value">{value}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-card(cols[0], "Current Price", f"${current_price:.2f}")
-card(cols[1], "Expected Mean", f"${mean_price:.2f}", mean_arrow, mean_delta, mean_color)
-card(cols[2], "Expected Median", f"${median_price:.2f}", median_arrow, median_delta, median_color)
-card(cols[3], "5th Percentile", f"${p5:.2f}")
-card(cols[4], "95th Percentile", f"${p95:.2f}")
+        delta_html = f'<div class="metric-delta" style="color:{color}">{arrow_symbol} {abs(delta):.2f}</div>'
+    return (
+        '<div class="card">'
+        f'<div class="metric-label">{label}</div>'
+        f'<div class="metric-value">{value}</div>'
+        f'{delta_html}'
+        '</div>'
+    )
+
+def card_row(*cards):
+    # One markdown element per row instead of one per card: a single delta for the frontend
+    st.markdown(f'<div class="card-row">{"".join(cards)}</div>', unsafe_allow_html=True)
+
+card_row(
+    card_html("Current Price", f"${current_price:.2f}"),
+    card_html("Expected Mean", f"${mean_price:.2f}", mean_arrow, mean_delta, mean_color),
+    card_html("Expected Median", f"${median_price:.2f}", median_arrow, median_delta, median_color),
+    card_html("5th Percentile", f"${p5:.2f}"),
+    card_html("95th Percentile", f"${p95:.2f}")
+)
 
 # ==========================================
 # RISK METRICS
 # ==========================================
-final_prices = paths[-1]
-sim_returns = (final_prices - current_price) / current_price
-expected_return = sim_returns.mean() * 100
-sharpe_ratio = sim_returns.mean() / sim_returns.std() if sim_returns.std() != 0 else 0
+expected_return = stats["expected_return"] * 100
+sharpe_ratio = stats["sharpe"]
 
 st.markdown('<div class="section-title">Risk Metrics</div>', unsafe_allow_html=True)
-rcols = st.columns(2)
-card(rcols[0], "Expected Return", f"{expected_return:.2f}%")
-card(rcols[1], "Sharpe Ratio", f"{sharpe_ratio:.2f}")
+card_row(
+    card_html("Expected Return", f"{expected_return:.2f}%"),
+    card_html("Sharpe Ratio", f"{sharpe_ratio:.2f}")
+)
 
 # ==========================================
 # MONTE CARLO PATHS
 # ==========================================
-st.markdown('<div class="section-title">Monte Carlo Price Paths</div>', unsafe_allow_html=True)
+if show_paths:
+    st.markdown('<div class="section-title">Monte Carlo Price Paths</div>', unsafe_allow_html=True)
 
-median_path = np.median(paths, axis=1)
-p5_path = np.percentile(paths, 5, axis=1)
-p95_path = np.percentile(paths, 95, axis=1)
+    median_path, p5_path, p95_path = percentile_paths(*sim_args)
 
-fig = go.Figure()
-fig.add_trace(go.Scatter(y=median_path, mode="lines", name="Median", line=dict(color="#3b82f6", width=3)))
-fig.add_trace(go.Scatter(y=p95_path, mode="lines", line=dict(color="rgba(59,130,246,0.3)"), showlegend=False))
-fig.add_trace(go.Scatter(y=p5_path, mode="lines", fill="tonexty", fillcolor="rgba(59,130,246,0.1)",
-                         line=dict(color="rgba(59,130,246,0.3)"), showlegend=False))
-fig.add_hline(y=current_price, line_dash="dash", line_color="#9ca3af")
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(y=median_path, mode="lines", name="Median", line=dict(color="#3b82f6", width=3)))
+    fig.add_trace(go.Scatter(y=p95_path, mode="lines", line=dict(color="rgba(59,130,246,0.3)"), showlegend=False))
+    fig.add_trace(go.Scatter(y=p5_path, mode="lines", fill="tonexty", fillcolor="rgba(59,130,246,0.1)",
+                             line=dict(color="rgba(59,130,246,0.3)"), showlegend=False))
+    fig.add_hline(y=current_price, line_dash="dash", line_color="#9ca3af")
 
-fig.update_layout(height=450, template="plotly_dark", margin=dict(l=20, r=20, t=30, b=20))
-st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(height=450, template="plotly_dark", margin=dict(l=20, r=20, t=30, b=20))
+    st.plotly_chart(fig, use_container_width=True)
 
 # ==========================================
 # DISTRIBUTION
@@ -213,8 +261,9 @@ st.plotly_chart(fig, use_container_width=True)
 st.markdown('<div class="section-title">Final Price Distribution</div>', unsafe_allow_html=True)
 
 hist = go.Figure()
-hist.add_trace(go.Histogram(x=final_prices, nbinsx=60, marker_color="#3b82f6"))
-hist.update_layout(height=400, template="plotly_dark", margin=dict(l=20, r=20, t=30, b=20))
+bin_centers, bin_counts = price_histogram(*sim_args, show_paths)
+hist.add_trace(go.Bar(x=bin_centers, y=bin_counts, marker_color="#3b82f6"))
+hist.update_layout(height=400, template="plotly_dark", margin=dict(l=20, r=20, t=30, b=20), bargap=0)
 st.plotly_chart(hist, use_container_width=True)
 
 st.divider()
@@ -0,0 +1,29 @@
+"""
+Ahead-of-time build of the CPU GBM kernel, for short-lived processes (scripts, batch jobs)
+that shouldn't pay Numba's JIT cost even once.
+
+Build it with:
+
+    python compile.py
+
+This writes the mc_gbm extension module next to monte_carlo.py. It is only used when
+MC_GBM_AOT=1 is set; otherwise monte_carlo uses the JIT kernel, which is compiled once per
+machine (cache=True) and runs across all cores. The AOT build is single-threaded, since
+pycc turns prange into a plain range, so leave it off for long-lived processes like the app.
+
+numba.pycc is deprecated upstream and emits NumbaPendingDeprecationWarning when imported.
+"""
+import os
+
+from numba.pycc import CC
+
+from monte_carlo import _gbm_fill
+
+cc = CC("mc_gbm")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# (paths, mirror_paths, z, drift, vol, pair_product); any-layout arrays so chunk views can be passed directly
+cc.export("gbm_fill", "void(f4[:,:], f4[:,:], f4[:,:], f4, f4, f4[:])")(_gbm_fill.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -1,10 +1,13 @@
+import streamlit as st
 import yfinance as yf
 import pandas as pd
 import numpy as np
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_stock_data(ticker, lookback_days):
     """
     Downloads historical stock data and calculates log returns.
+    Results are cached for an hour per (ticker, lookback_days), so slider changes skip the download.
 
     Parameters:
     - ticker (str): Stock symbol, e.g., "AAPL"
@@ -12,12 +15,19 @@ def get_stock_data(ticker, lookback_days):
 
     Returns:
     - S0 (float): Latest closing price
-    - returns (pd.Series): Log returns for the lookback period
+    - returns (np.ndarray): float32 log returns for the lookback period
+    - mu (float): Mean daily log return
+    - sigma (float): Daily volatility (sample std dev of log returns)
     """
     data = yf.download(ticker, period=f"{lookback_days}d")
     if data.empty:
         raise ValueError("Ticker not found or no data available")
     prices = data['Close']
     S0 = float(prices.iloc[-1])  # ensure S0 is a float
-    returns = np.log(prices / prices.shift(1)).dropna()
-    return S0, returns
+    # One log and one diff over a contiguous buffer; a plain array also pickles cheaply into the cache
+    p = prices.to_numpy(dtype=np.float32).ravel()
+    p = p[np.isfinite(p)]  # drop missing closes, which would otherwise make mu and sigma NaN
+    returns = np.diff(np.log(p))
+    mu = float(returns.mean())
+    sigma = float(returns.std(ddof=1))
+    return S0, returns, mu, sigma
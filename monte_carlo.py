@@ -1,7 +1,110 @@
+import math
+import multiprocessing
+import os
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numba import njit, prange, set_num_threads
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+# Columns per CPU chunk. The reused normals buffer is (days - 1) x 2048 float32, ~1.4 MB at
+# 180 days; with the chunk's paths and mirrors that is ~4 MB, so L3- rather than L2-sized.
+CPU_CHUNK_SIMS = 2048
+
+SAMPLERS = ("pseudo", "sobol")
 
 # -------------------- Monte Carlo Simulation --------------------
-def simulate_price_paths(S0, mu, sigma, days, sims, shock_size=0.0, shock_day=None):
+@njit(parallel=True, fastmath=True, cache=True)
+def _gbm_fill(paths, mirror_paths, z, drift, vol, pair_product):
+    """
+    Numba GBM kernel. Column j of paths is driven by the normals in z[:, j]; the first
+    mirror_paths.shape[1] columns also drive an antithetic partner in mirror_paths with -z.
+    Row 0 of both must already hold S0. Columns run in parallel.
+
+    Prices accumulate in the log domain with one exp per stored day. An antithetic pair's
+    log prices sum to a deterministic value, so the mirror costs a division by the
+    precomputed pair_product[t] = S0**2 * exp(2 * drift * t) instead of a second exp.
+    """
+    days = paths.shape[0]
+    n_mirror = mirror_paths.shape[1]
+    for j in prange(paths.shape[1]):
+        mirror = j < n_mirror
+        lp = math.log(paths[0, j])
+        for t in range(1, days):
+            lp += drift + vol * z[t-1, j]
+            price = math.exp(lp)
+            paths[t, j] = price
+            if mirror:
+                mirror_paths[t, j] = pair_product[t] / price
+
+
+# The parallel JIT kernel is the default (cache=True compiles it once per machine). The
+# single-threaded AOT build from compile.py is opt-in via MC_GBM_AOT=1, for short-lived
+# processes where even that one compile matters more than multicore throughput.
+_gbm_fill_cpu = _gbm_fill
+if os.environ.get("MC_GBM_AOT") == "1":
+    try:
+        from mc_gbm import gbm_fill as _gbm_fill_cpu
+    except ImportError:
+        pass
+
+
+def _cuda_available():
+    try:
+        from numba import cuda
+    except ImportError:
+        return False
+    return cuda.is_available()
+
+
+def _gbm_params(mu, sigma):
+    """
+    Per-step GBM log drift and volatility, as float32: halves memory traffic,
+    and MC noise dwarfs the rounding error.
+    """
+    mu = np.float32(mu)
+    sigma = np.float32(sigma)
+
+    dt = np.float32(1)  # daily steps
+    drift = (mu - np.float32(0.5) * sigma**2) * dt
+    vol = sigma * np.sqrt(dt)
+    return drift, vol
+
+
+def _normal_chunks(seed, days, m, sampler="pseudo"):
+    """
+    Yield (c0, c1, z) for columns [c0, c1) of a (days - 1) x m matrix of standard normals,
+    CPU_CHUNK_SIMS columns at a time. z reuses one preallocated buffer, so consume it
+    before advancing. Drawing outside the kernels keeps a seed reproducible regardless
+    of the thread count, and gives identical draws to every CPU path for the same seed.
+
+    sampler "pseudo" draws from PCG64; "sobol" maps a scrambled Sobol' sequence (one
+    dimension per day, one point per column) through the inverse normal CDF.
+    """
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler {sampler!r}, expected one of {SAMPLERS}")
+
+    if sampler == "sobol":
+        sobol = qmc.Sobol(d=days - 1, scramble=True, seed=seed)
+    else:
+        rng = np.random.default_rng(seed)
+
+    z_buf = np.empty((days - 1) * min(m, CPU_CHUNK_SIMS), dtype=np.float32)
+    for c0 in range(0, m, CPU_CHUNK_SIMS):
+        c1 = min(c0 + CPU_CHUNK_SIMS, m)
+        z = z_buf[:(days - 1) * (c1 - c0)].reshape(days - 1, c1 - c0)
+        if sampler == "sobol":
+            # Draw a power of two (padding the last chunk) to keep Sobol's balance properties
+            u = sobol.random(1 << (c1 - c0 - 1).bit_length())[:c1 - c0]
+            z[...] = ndtri(u).T
+        else:
+            rng.standard_normal(dtype=np.float32, out=z)
+        yield c0, c1, z
+
+
+def simulate_price_paths(S0, mu, sigma, days, sims, shock_size=0.0, shock_day=None, seed=None,
+                         antithetic=True, order="C", sampler="pseudo", use_gpu=False):
     """
     Simulate future stock prices using Geometric Brownian Motion (GBM),
     with optional sudden shock applied on a specific day.
@@ -14,39 +117,121 @@ def simulate_price_paths(S0, mu, sigma, days, sims, shock_size=0.0, shock_day=No
     - sims: int, number of simulation paths
     - shock_size: float, optional sudden price jump (%) applied on shock_day
     - shock_day: int, optional day (1-indexed) to apply the shock
+    - seed: int, optional seed for the random number generator
+    - antithetic: bool, pair each path with a mirror driven by the negated normals;
+      halves the random draws and reduces variance, while still returning `sims` paths
+    - order: "C" or "F", memory layout of the returned array. "C" keeps each day contiguous
+      (per-day quantiles, as in the app); "F" keeps each simulation contiguous, which suits
+      per-path analytics such as time_to_target
+    - sampler: "pseudo" or "sobol". Sobol' quasi-random normals converge faster than
+      pseudo-random ones, sharpening the tail percentiles for the same `sims`
+    - use_gpu: bool, opt in to the CUDA kernel when a GPU is available; otherwise the Numba
+      CPU kernel runs. Only the pseudo-random sampler has a GPU kernel. The GPU draws from its
+      own xoroshiro128+ streams, so the same seed gives different paths than on the CPU
 
     Returns:
-    - paths: 2D numpy array (days x sims) of simulated prices
+    - paths: 2D float32 numpy array (days x sims) of simulated prices
     """
-    S0 = float(S0)
-    mu = float(mu)
-    sigma = float(sigma)
+    S0 = np.float32(S0)
+    drift, vol = _gbm_params(mu, sigma)
+    n_mirror = sims // 2 if antithetic else 0
+
+    # Product of each antithetic pair's prices on day t (their log prices sum to a constant)
+    pair_product = (S0 * S0 * np.exp(2 * drift * np.arange(days, dtype=np.float32))).astype(np.float32)
 
-    dt = 1  # daily steps
-    paths = np.zeros((days, sims))
-    paths[0] = S0
+    if use_gpu and sampler == "pseudo" and _cuda_available():
+        # Imported here so CPU-only use never loads numba.cuda
+        from monte_carlo_gpu import simulate_gpu
+        paths = simulate_gpu(S0, drift, vol, pair_product, days, sims, n_mirror, seed)
+        if order == "F":
+            paths = np.asfortranarray(paths)
+    else:
+        paths = np.empty((days, sims), dtype=np.float32, order=order)
+        paths[0] = S0
 
-    for t in range(1, days):
-        z = np.random.standard_normal(sims)
-        paths[t] = paths[t-1] * np.exp((mu - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * z)
+        m = sims - n_mirror
+        for c0, c1, z in _normal_chunks(seed, days, m, sampler):
+            _gbm_fill_cpu(paths[:, c0:c1], paths[:, m + c0:m + min(c1, n_mirror)], z, drift, vol, pair_product)
 
-        # Apply sudden shock if specified
-        if shock_day and t == shock_day - 1:
-            paths[t] *= (1 + shock_size / 100)
+    # Apply sudden shock if specified (persists for every later day)
+    if shock_day and 1 <= shock_day - 1 < days:
+        paths[shock_day - 1:] *= np.float32(1 + shock_size / 100)
 
     return paths
 
+def simulate_final_only(S0, mu, sigma, days, sims, shock_size=0.0, shock_day=None, seed=None,
+                        antithetic=True, sampler="pseudo"):
+    """
+    Simulate only the final-day prices of simulate_price_paths, without building the
+    (days x sims) matrix: each path's log increments are summed and exponentiated once.
+    Memory is O(sims), and for the same seed the final prices match
+    simulate_price_paths(...)[-1] on the CPU up to float32 rounding.
+
+    Parameters are the same as simulate_price_paths (minus order).
+
+    Returns:
+    - final_prices: 1D float32 numpy array (sims) of simulated final prices
+    """
+    S0 = np.float32(S0)
+    drift, vol = _gbm_params(mu, sigma)
+    n_mirror = sims // 2 if antithetic else 0
+
+    m = sims - n_mirror
+    z_sum = np.empty(sims, dtype=np.float32)
+    for c0, c1, z in _normal_chunks(seed, days, m, sampler):
+        z.sum(axis=0, out=z_sum[c0:c1])
+
+    # Antithetic mirrors see the negated normals, so their sum is just negated
+    np.negative(z_sum[:n_mirror], out=z_sum[m:])
+
+    log_sum = (days - 1) * drift + vol * z_sum
+
+    # Apply sudden shock if specified (still in effect on the final day)
+    if shock_day and 1 <= shock_day - 1 < days:
+        log_sum += np.log1p(np.float32(shock_size) / 100)
+
+    return S0 * np.exp(log_sum)
+
 # -------------------- Statistics --------------------
+def _sorted_percentile(sorted_values, q):
+    """
+    Linearly interpolated percentile (same as np.percentile's default) of an already sorted array.
+    """
+    pos = (sorted_values.size - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, sorted_values.size - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
 def get_price_statistics(paths):
     """
-    Calculate mean, median, and 5% / 95% percentiles of final prices.
+    Calculate the final-price statistics (see get_final_price_statistics) of a paths matrix.
+    """
+    return get_final_price_statistics(paths[-1], float(paths[0, 0]))
+
+
+def get_final_price_statistics(final_prices, S0):
+    """
+    Calculate mean, std, median, and 5% / 95% percentiles of final prices,
+    plus the expected return and Sharpe ratio relative to the starting price S0.
+
+    Final prices are sorted once and the percentiles read straight off the sorted array.
+    Mean and std accumulate in float64 over the float32 prices; all results are returned as Python floats.
     """
-    final_prices = paths[-1]
+    S0 = float(S0)
+    sorted_prices = np.sort(final_prices)
+
+    mean = float(np.mean(final_prices, dtype=np.float64))
+    std = float(np.std(final_prices, dtype=np.float64))
+
     stats = {
-        "mean": float(np.mean(final_prices)),
-        "median": float(np.median(final_prices)),
-        "p5": float(np.percentile(final_prices, 5)),
-        "p95": float(np.percentile(final_prices, 95))
+        "mean": mean,
+        "std": std,
+        "median": float(_sorted_percentile(sorted_prices, 50)),
+        "p5": float(_sorted_percentile(sorted_prices, 5)),
+        "p95": float(_sorted_percentile(sorted_prices, 95)),
+        "expected_return": (mean - S0) / S0,
+        "sharpe": (mean - S0) / std if std != 0 else 0.0
     }
     return stats
 
@@ -56,11 +241,79 @@ def time_to_target(paths, target):
     Estimate how long it takes for each simulation path to reach a target price.
 
     Returns a list of days for each path that hits the target.
+    Scans down each simulation, so paths simulated with order="F" are read contiguously.
+    """
+    mask = paths >= float(target)
+    any_hit = mask.any(axis=0)
+    first_day = mask.argmax(axis=0)  # argmax returns the first True along each column
+    return first_day[any_hit].tolist()
+
+# -------------------- Path Analytics --------------------
+def rolling_max(paths, window):
+    """
+    Rolling maximum price over the trailing `window` days of every path.
+
+    Returns a ((days - window + 1) x sims) array; row i covers days i .. i + window - 1.
+    Built on a strided view, so no per-simulation loop or window copies.
+    """
+    windows = sliding_window_view(paths, window_shape=window, axis=0)
+    return windows.max(axis=-1)
+
+
+def max_drawdown(paths):
+    """
+    Largest peak-to-trough drop of each simulation path, as a negative fraction
+    (e.g. -0.25 for a 25% drawdown).
+
+    Returns a 1D array (sims) of max drawdowns.
+    """
+    running_max = np.maximum.accumulate(paths, axis=0)
+    drawdowns = paths / running_max - 1
+    return drawdowns.min(axis=0)
+
+# -------------------- Scenarios --------------------
+def _limit_worker_threads():
+    # Each worker process gets one core; Numba's own threads would oversubscribe it
+    set_num_threads(1)
+
+
+def _run_scenario(kwargs):
+    return simulate_price_paths(**kwargs)
+
+
+def run_scenarios(scenarios, seed=None):
     """
-    target = float(target)
-    hit_days = []
-    for sim in range(paths.shape[1]):
-        hits = np.where(paths[:, sim] >= target)[0]
-        if len(hits) > 0:
-            hit_days.append(hits[0])
-    return hit_days
+    Simulate several independent scenarios (tickers, shocks, ...) in parallel worker processes.
+
+    Parameters:
+    - scenarios: list of dicts with simulate_price_paths keyword arguments
+      (S0, mu, sigma, days, sims, and optionally shock_size, shock_day, ...),
+      plus an optional "name" used as the result key (defaults to the list index)
+    - seed: int, optional base seed; scenario i is seeded with seed + i so streams don't overlap
+
+    Returns:
+    - results: dict mapping each scenario's name to its (days x sims) paths array
+
+    A single scenario runs in-process, since spawning a pool would cost more than it saves.
+    Workers are started with "spawn": forking after the parallel Numba kernel has run
+    copies its thread pool's state into the children and hangs the parent on exit.
+    As with any spawn pool, scripts calling this need an `if __name__ == "__main__":` guard.
+    """
+    if seed is None:
+        seed = int(np.random.default_rng().integers(2**31))
+
+    names = []
+    jobs = []
+    for i, scenario in enumerate(scenarios):
+        kwargs = dict(scenario)
+        names.append(kwargs.pop("name", i))
+        kwargs.setdefault("seed", seed + i)
+        jobs.append(kwargs)
+
+    if len(jobs) < 2:
+        return {name: _run_scenario(kwargs) for name, kwargs in zip(names, jobs)}
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(min(os.cpu_count() or 1, len(jobs)), initializer=_limit_worker_threads) as pool:
+        results = pool.map(_run_scenario, jobs)
+    return dict(zip(names, results))
@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+from numba import cuda
+from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_normal_float32
+
+GPU_THREADS_PER_BLOCK = 128
+
+# -------------------- CUDA Simulation --------------------
+@cuda.jit
+def _gbm_kernel(paths, S0, drift, vol, pair_product, n_mirror, rng_states):
+    """
+    CUDA GBM kernel: one thread per simulation column (plus its antithetic mirror, if any).
+    Each thread walks all days with its own xoroshiro128+ stream, in the log domain like
+    monte_carlo._gbm_fill.
+    """
+    m = paths.shape[1] - n_mirror
+    j = cuda.grid(1)
+    if j >= m:
+        return
+
+    mirror = j < n_mirror
+    lp = math.log(S0)
+    paths[0, j] = S0
+    if mirror:
+        paths[0, m + j] = S0
+    for t in range(1, paths.shape[0]):
+        z = xoroshiro128p_normal_float32(rng_states, j)
+        lp += drift + vol * z
+        price = math.exp(lp)
+        paths[t, j] = price
+        if mirror:
+            paths[t, m + j] = pair_product[t] / price
+
+
+def simulate_gpu(S0, drift, vol, pair_product, days, sims, n_mirror, seed):
+    """
+    Run _gbm_kernel on the GPU and copy the (days x sims) paths back to the host.
+    Called by monte_carlo.simulate_price_paths(use_gpu=True).
+    """
+    if seed is None:
+        seed = int(np.random.default_rng().integers(2**63))
+
+    m = sims - n_mirror
+    d_paths = cuda.device_array((days, sims), dtype=np.float32)
+    rng_states = create_xoroshiro128p_states(m, seed=seed)
+    blocks = (m + GPU_THREADS_PER_BLOCK - 1) // GPU_THREADS_PER_BLOCK
+    _gbm_kernel[blocks, GPU_THREADS_PER_BLOCK](d_paths, S0, drift, vol, cuda.to_device(pair_product),
+                                               n_mirror, rng_states)
+    return d_paths.copy_to_host()
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import monte_carlo  # noqa: E402
+
+S0, MU, SIGMA = 100.0, 0.0005, 0.02
+
+
+def test_run_scenarios_after_parallel_kernel_exits_cleanly():
+    # Regression: a fork-based pool started after the parallel Numba kernel hung the parent on exit
+    script = textwrap.dedent("""
+        import monte_carlo
+
+        if __name__ == "__main__":
+            monte_carlo.simulate_price_paths(100, 0.001, 0.02, 30, 5000, seed=1)
+            scenario = dict(S0=100, mu=0.001, sigma=0.02, days=30, sims=5000)
+            results = monte_carlo.run_scenarios([scenario, scenario], seed=1)
+            assert sorted(results) == [0, 1]
+            assert results[0].shape == (30, 5000)
+    """)
+    proc = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, timeout=120,
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_antithetic_pair_product_is_deterministic():
+    paths = monte_carlo.simulate_price_paths(S0, MU, SIGMA, 30, 1000, seed=1)
+    drift, _ = monte_carlo._gbm_params(MU, SIGMA)
+    expected = S0**2 * np.exp(2 * float(drift) * np.arange(30))
+    np.testing.assert_allclose(paths[:, :500] * paths[:, 500:], np.tile(expected[:, None], 500), rtol=1e-5)
+
+
+def test_fortran_order_matches_c_order():
+    c_paths = monte_carlo.simulate_price_paths(S0, MU, SIGMA, 30, 1001, seed=2, order="C")
+    f_paths = monte_carlo.simulate_price_paths(S0, MU, SIGMA, 30, 1001, seed=2, order="F")
+    assert f_paths.flags.f_contiguous
+    np.testing.assert_array_equal(f_paths, c_paths)
+
+
+def test_shock_scales_every_day_from_shock_day():
+    base = monte_carlo.simulate_price_paths(S0, MU, SIGMA, 30, 1000, seed=3)
+    shocked = monte_carlo.simulate_price_paths(S0, MU, SIGMA, 30, 1000, seed=3, shock_size=-20, shock_day=10)
+    np.testing.assert_array_equal(shocked[:9], base[:9])
+    np.testing.assert_allclose(shocked[9:], base[9:] * 0.8, rtol=1e-6)
+
+
+def test_final_log_price_moments_match_gbm():
+    days = 31
+    paths = monte_carlo.simulate_price_paths(S0, MU, SIGMA, days, 200_000, seed=4)
+    log_return = np.log(paths[-1].astype(np.float64) / S0)
+    steps = days - 1
+    np.testing.assert_allclose(log_return.mean(), steps * (MU - 0.5 * SIGMA**2), rtol=1e-3)
+    np.testing.assert_allclose(log_return.std(), SIGMA * np.sqrt(steps), rtol=1e-2)
+
+
+def test_final_only_matches_last_row_of_paths():
+    kwargs = dict(seed=5, shock_size=15, shock_day=12)
+    final_prices = monte_carlo.simulate_final_only(S0, MU, SIGMA, 40, 3001, **kwargs)
+    paths = monte_carlo.simulate_price_paths(S0, MU, SIGMA, 40, 3001, **kwargs)
+    np.testing.assert_allclose(final_prices, paths[-1], rtol=1e-5)
+
+
+def test_final_price_statistics_match_numpy():
+    final_prices = monte_carlo.simulate_final_only(S0, MU, SIGMA, 30, 5001, seed=6)
+    stats = monte_carlo.get_final_price_statistics(final_prices, S0)
+    prices = final_prices.astype(np.float64)
+    np.testing.assert_allclose(stats["median"], np.median(prices), rtol=1e-6)
+    np.testing.assert_allclose(stats["p5"], np.percentile(prices, 5), rtol=1e-6)
+    np.testing.assert_allclose(stats["p95"], np.percentile(prices, 95), rtol=1e-6)
+    np.testing.assert_allclose(stats["mean"], prices.mean(), rtol=1e-9)
+    np.testing.assert_allclose(stats["std"], prices.std(), rtol=1e-9)
+
+
+def test_time_to_target_matches_per_path_loop():
+    paths = monte_carlo.simulate_price_paths(S0, MU, SIGMA, 60, 2000, seed=7, order="F")
+    target = S0 * 1.1
+    expected = []
+    for sim in range(paths.shape[1]):
+        hits = np.where(paths[:, sim] >= target)[0]
+        if len(hits) > 0:
+            expected.append(hits[0])
+    result = monte_carlo.time_to_target(paths, target)
+    assert 0 < len(result) < paths.shape[1]
+    assert result == expected